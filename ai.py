@@ -1,7 +1,174 @@
+import heapq
+import numba as nb
 import numpy as np
-from typing import Tuple, List
+from typing import Tuple, List, NamedTuple, Optional
+import threading
 import time
 
+BOARD_SIZE = 15
+DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+# 两格范围内的 24 个邻居偏移量 (dr, dc)
+NEIGHBORS = np.array([(dr, dc) for dr in range(-2, 3) for dc in range(-2, 3) if (dr, dc) != (0, 0)], dtype=np.int8)
+
+def _neighbor_cells(row: int, col: int) -> np.ndarray:
+    """(row, col) 两格范围内、位于棋盘上的邻居格子（编码为 row * BOARD_SIZE + col）"""
+    rr = row + NEIGHBORS[:, 0].astype(np.intp)
+    cc = col + NEIGHBORS[:, 1].astype(np.intp)
+    mask = (rr >= 0) & (rr < BOARD_SIZE) & (cc >= 0) & (cc < BOARD_SIZE)
+    return rr[mask] * BOARD_SIZE + cc[mask]
+
+# 每个格子的邻居表，下标为 row * BOARD_SIZE + col
+NEIGHBOR_CELLS = [_neighbor_cells(row, col) for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)]
+
+# 候选点威胁评分：(五连, 活四, 活三, 活二, 跳三, 双活三)，分别对应己方进攻和阻止对手
+THREAT_SCORES = (
+    (1000000, 100000, 10000, 1000, 8000, 50000),
+    (900000, 90000, 9000, 900, 7000, 45000),
+)
+
+# 棋盘评估中长度为 k 的连续段的得分（k >= 5 按五连计），分别对应己方和对手
+RUN_SCORES = (
+    (0, 0, 100, 1000, 10000, 100000),
+    (0, 0, 90, 900, 9000, 90000),
+)
+
+def _position_scores(center: int, near_center: int) -> np.ndarray:
+    """棋子位置得分：中心区域加分更多，靠近中心次之"""
+    scores = np.zeros((BOARD_SIZE, BOARD_SIZE), dtype=np.int64)
+    scores[2:13, 2:13] = near_center
+    scores[3:12, 3:12] = center
+    return scores
+
+# 棋盘评估中的位置得分，下标 0 为己方，1 为对手
+POSITION_SCORES = np.stack([_position_scores(50, 30), _position_scores(45, 25)])
+
+# 搜索窗口的整数边界（评估分数都是整数，远小于该值）
+NEG_INF = -1_000_000_000
+POS_INF = 1_000_000_000
+
+# 置换表条目的边界类型
+EXACT = 0  # 精确值
+LOWER = 1  # 下界（发生了 beta 剪枝）
+UPPER = 2  # 上界（所有走法都没有超过 alpha）
+
+class SearchAborted(Exception):
+    """搜索被 stop_event 取消"""
+
+class TTEntry(NamedTuple):
+    """置换表条目"""
+    key: int
+    value: int
+    depth: int
+    flag: int
+    best_move: Optional[Tuple[int, int]]
+
+@nb.njit(nb.boolean(nb.int8[:, ::1], nb.int64, nb.int64, nb.int64, nb.int64, nb.int64, nb.int64, nb.boolean), cache=True)
+def check_dir(board: np.ndarray, row: int, col: int, dr: int, dc: int, player: int, length: int, is_alive: bool) -> bool:
+    """检查经过 (row, col) 的某一个方向上是否形成特定模式"""
+    count = 1
+    # 正向检查
+    r1, c1 = row + dr, col + dc
+    while 0 <= r1 < BOARD_SIZE and 0 <= c1 < BOARD_SIZE and board[r1, c1] == player:
+        count += 1
+        r1 += dr
+        c1 += dc
+    # 反向检查
+    r2, c2 = row - dr, col - dc
+    while 0 <= r2 < BOARD_SIZE and 0 <= c2 < BOARD_SIZE and board[r2, c2] == player:
+        count += 1
+        r2 -= dr
+        c2 -= dc
+    if count < length:
+        return False
+    if not is_alive:
+        return True
+    # 检查连续段两端是否都是空位
+    return (0 <= r1 < BOARD_SIZE and 0 <= c1 < BOARD_SIZE and board[r1, c1] == 0 and
+            0 <= r2 < BOARD_SIZE and 0 <= c2 < BOARD_SIZE and board[r2, c2] == 0)
+
+@nb.njit(nb.boolean(nb.int8[:, ::1], nb.int64, nb.int64, nb.int64, nb.int64, nb.boolean), cache=True)
+def count_pattern(board: np.ndarray, row: int, col: int, player: int, length: int, is_alive: bool) -> bool:
+    """计算特定模式的连续棋子数（任意一个方向满足即可）"""
+    for dr, dc in DIRECTIONS:
+        if check_dir(board, row, col, dr, dc, player, length, is_alive):
+            return True
+    return False
+
+@nb.njit(nb.types.UniTuple(nb.int64[:, ::1], 3)(nb.int8[:, ::1], nb.int64, nb.int64, nb.int64), cache=True)
+def scan_move(board: np.ndarray, row: int, col: int, player: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """假设空位 (row, col) 分别由双方落子，一次扫描四个方向的连子、活口和跳连"""
+    # 第一维 0 为 player、1 为对手，第二维对应 DIRECTIONS
+    runs = np.ones((2, 4), dtype=np.int64)    # 经过该点的连续棋子数
+    opens = np.zeros((2, 4), dtype=np.int64)  # 连续段两端的空位数
+    jumps = np.ones((2, 4), dtype=np.int64)   # 越过空位直到对方棋子或边界的同色棋子数
+    for side in range(2):
+        color = player if side == 0 else -player
+        for d in range(4):
+            dr, dc = DIRECTIONS[d]
+            for sign in (1, -1):
+                r, c = row + sign * dr, col + sign * dc
+                # 连续段
+                while 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and board[r, c] == color:
+                    runs[side, d] += 1
+                    jumps[side, d] += 1
+                    r += sign * dr
+                    c += sign * dc
+                if 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and board[r, c] == 0:
+                    opens[side, d] += 1
+                    # 跳连：越过空位继续计数
+                    while 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and board[r, c] != -color:
+                        if board[r, c] == color:
+                            jumps[side, d] += 1
+                        r += sign * dr
+                        c += sign * dc
+    return runs, opens, jumps
+
+@nb.njit(nb.int64(nb.int64, nb.boolean), cache=True)
+def run_score(length: int, is_own: bool) -> int:
+    """一条长度为 length 的连续段在其所在直线上的得分（正反两个方向各计一次）"""
+    weights = RUN_SCORES[0] if is_own else RUN_SCORES[1]
+    score = 0
+    for k in range(2, min(length, 4) + 1):
+        score += weights[k]
+    if length >= 5:
+        score += (length - 4) * weights[5]
+    return 2 * score
+
+@nb.njit(nb.int64(nb.int8[:, ::1], nb.int64), cache=True)
+def evaluate_board(board: np.ndarray, player: int) -> int:
+    """评估当前棋盘状态"""
+    score = 0
+    for i in range(BOARD_SIZE):
+        for j in range(BOARD_SIZE):
+            stone = board[i, j]
+            if stone == 0:
+                continue
+            # 评估连续棋子：每条连续段只从起点统计一次
+            for dr, dc in DIRECTIONS:
+                pi, pj = i - dr, j - dc
+                if 0 <= pi < BOARD_SIZE and 0 <= pj < BOARD_SIZE and board[pi, pj] == stone:
+                    continue
+                count = 1
+                ni, nj = i + dr, j + dc
+                while 0 <= ni < BOARD_SIZE and 0 <= nj < BOARD_SIZE and board[ni, nj] == stone:
+                    count += 1
+                    ni += dr
+                    nj += dc
+                if stone == player:
+                    score += run_score(count, True)
+                else:
+                    # 对对手的棋子进行负分评估
+                    score -= run_score(count, False)
+            
+            # 评估棋子的位置
+            if stone == player:
+                score += POSITION_SCORES[0, i, j]
+            else:
+                score -= POSITION_SCORES[1, i, j]
+    
+    return score
+
 class GomokuAI:
     def __init__(self, difficulty: str = 'medium'):
         self.difficulty = difficulty
@@ -11,6 +178,16 @@ class GomokuAI:
             'hard': 6
         }
         self.depth = self.depths.get(difficulty, 5)
+        # 迭代加深的时间预算（秒），超时后不再开始更深一层的搜索
+        self.time_limit = 5.0
+        # 设置后正在进行的搜索会尽快结束，返回已完成的最深一层的结果
+        self.stop_event = threading.Event()
+        # 走法排序：每个剩余深度记录两个杀手移动 (row, col)，None 表示空
+        self.killers = [[None, None] for _ in range(self.depth + 1)]
+        # 历史表：每个格子引发剪枝的累计得分
+        self.history = {(r, c): 0 for r in range(BOARD_SIZE) for c in range(BOARD_SIZE)}
+        # 本次搜索是否已有剪枝记入历史表（未记入时无需按历史排序）
+        self._history_used = False
         # 开局库
         self.opening_moves = [
             [(7,7)],  # 天元
@@ -22,9 +199,17 @@ class GomokuAI:
             [(7,7), (7,6)],  # 天元+左
         ]
         self.move_count = 0
-        # 缓存最近的计算结果
-        self.cache = {}
-        self.cache_size = 10000
+        # 置换表：每个桶两个槽位，一个深度优先替换，一个总是替换
+        self.tt_size = 1 << 16
+        self._tt_deep = [None] * self.tt_size
+        self._tt_recent = [None] * self.tt_size
+        # Zobrist 哈希表：每个 (行, 列, 棋子颜色) 对应一个随机数
+        self._zobrist = np.random.default_rng(1).integers(1, 2**63, size=(15, 15, 2), dtype=np.uint64)
+        self._hash = 0
+        # 候选落子点：已有棋子两格范围内的空位，编码为 row * BOARD_SIZE + col
+        self._candidates = set()
+        # 每个格子两格范围内的棋子数量（按 row * BOARD_SIZE + col 展平），降为 0 时从候选集合移除
+        self._cand_refs = np.zeros(BOARD_SIZE * BOARD_SIZE, dtype=np.int16)
         
     def get_move(self, board: np.ndarray, player: int) -> Tuple[int, int]:
         """获取 AI 的下一步移动"""
@@ -37,15 +222,24 @@ class GomokuAI:
                         self.move_count += 1
                         return move
         
-        # 检查缓存
+        # 搜索和 Numba 函数都要求 C 连续的 int8 棋盘
+        board = np.ascontiguousarray(board, dtype=np.int8)
+        
+        # 从完整棋盘重建哈希和候选点，之后在搜索中增量维护
+        self._rebuild_hash(board)
+        self._rebuild_candidates(board)
+        
+        # 检查置换表
         board_key = self._board_to_key(board)
-        if board_key in self.cache:
-            return self.cache[board_key]
+        entry = self._tt_probe(board_key)
+        if entry and entry.depth >= self.depth and entry.flag == EXACT and entry.best_move:
+            return entry.best_move
         
-        best_score = float('-inf')
+        start_time = time.time()
+        self.killers = [[None, None] for _ in range(self.depth + 1)]
+        self.history = dict.fromkeys(self.history, 0)
+        self._history_used = False
         best_move = None
-        alpha = float('-inf')
-        beta = float('inf')
         
         # 获取所有可能的移动，并按照威胁度排序
         possible_moves = self._get_possible_moves(board)
@@ -54,268 +248,249 @@ class GomokuAI:
         # 增加搜索的移动数量
         possible_moves = possible_moves[:20]  # 从15增加到20
         
-        for move in possible_moves:
-            board[move[0]][move[1]] = player
-            score = self._minimax(board, self.depth - 1, False, alpha, beta, -player)
-            board[move[0]][move[1]] = 0
+        # 迭代加深：上一层找到的最佳移动（记录在置换表中）优先搜索
+        for depth in range(1, self.depth + 1):
+            entry = self._tt_probe(board_key)
+            if entry:
+                possible_moves = self._tt_move_first(possible_moves, entry)
             
-            if score > best_score:
-                best_score = score
-                best_move = move
-            alpha = max(alpha, best_score)
-        
-        # 保存到缓存
-        if len(self.cache) < self.cache_size:
-            self.cache[board_key] = best_move
+            best_score = NEG_INF
+            depth_best_move = None
+            alpha = NEG_INF
+            beta = POS_INF
+            try:
+                for move in possible_moves:
+                    self._place(board, move[0], move[1], player)
+                    try:
+                        score = -self._negamax(board, depth - 1, -beta, -alpha, -player, move)
+                    finally:
+                        self._remove(board, move[0], move[1])
+                    
+                    if score > best_score:
+                        best_score = score
+                        depth_best_move = move
+                    alpha = max(alpha, best_score)
+            except SearchAborted:
+                # 被取消时丢弃未完成的这一层
+                break
+            
+            best_move = depth_best_move
+            # 保存到置换表
+            self._tt_store(board_key, best_score, depth, EXACT, best_move)
+            
+            if time.time() - start_time > self.time_limit:
+                break
         
+        if best_move is None:
+            best_move = possible_moves[0]
         self.move_count += 1
         return best_move
     
-    def _board_to_key(self, board: np.ndarray) -> str:
-        """将棋盘状态转换为缓存键"""
-        return str(board.tobytes())
+    def _board_to_key(self, board: np.ndarray) -> int:
+        """将棋盘状态转换为缓存键（增量维护的 Zobrist 哈希）"""
+        return self._hash
     
-    def _minimax(self, board: np.ndarray, depth: int, is_maximizing: bool, 
-                 alpha: float, beta: float, player: int) -> float:
-        """极大极小算法实现"""
-        if depth == 0 or self._is_game_over(board):
-            return self._evaluate_board(board, player)
-            
-        if is_maximizing:
-            max_eval = float('-inf')
-            for move in self._get_possible_moves(board)[:10]:  # 从8增加到10
-                board[move[0]][move[1]] = player
-                eval = self._minimax(board, depth - 1, False, alpha, beta, -player)
-                board[move[0]][move[1]] = 0
-                max_eval = max(max_eval, eval)
-                alpha = max(alpha, eval)
-                if beta <= alpha:
-                    break
-            return max_eval
+    def _rebuild_hash(self, board: np.ndarray):
+        """根据完整棋盘重新计算 Zobrist 哈希"""
+        self._hash = 0
+        for row, col in zip(*np.nonzero(board)):
+            self._toggle(int(row), int(col), board[row, col])
+    
+    def _rebuild_candidates(self, board: np.ndarray):
+        """根据完整棋盘重新计算候选落子点"""
+        self._candidates = set()
+        self._cand_refs = np.zeros(BOARD_SIZE * BOARD_SIZE, dtype=np.int16)
+        for row, col in zip(*np.nonzero(board)):
+            self._add_neighbors(board, int(row), int(col))
+    
+    def _add_neighbors(self, board: np.ndarray, row: int, col: int):
+        """新落子 (row, col) 后，把周围两格内的空位加入候选集合"""
+        cell = row * BOARD_SIZE + col
+        neighbors = NEIGHBOR_CELLS[cell]
+        self._cand_refs[neighbors] += 1
+        self._candidates.discard(cell)
+        self._candidates.update(neighbors[board.reshape(-1)[neighbors] == 0].tolist())
+    
+    def _remove_neighbors(self, board: np.ndarray, row: int, col: int):
+        """撤销 (row, col) 的棋子后，移除不再邻近任何棋子的候选点"""
+        cell = row * BOARD_SIZE + col
+        neighbors = NEIGHBOR_CELLS[cell]
+        self._cand_refs[neighbors] -= 1
+        self._candidates.difference_update(neighbors[self._cand_refs[neighbors] == 0].tolist())
+        if self._cand_refs[cell] > 0:
+            self._candidates.add(cell)
+    
+    def _toggle(self, row: int, col: int, player: int):
+        """在哈希中加入或移除一个棋子"""
+        self._hash ^= int(self._zobrist[row, col, 0 if player == 1 else 1])
+    
+    def _place(self, board: np.ndarray, row: int, col: int, player: int):
+        """落子并更新哈希和候选点"""
+        board[row, col] = player
+        self._toggle(row, col, player)
+        self._add_neighbors(board, row, col)
+    
+    def _remove(self, board: np.ndarray, row: int, col: int):
+        """撤销落子并更新哈希和候选点"""
+        self._toggle(row, col, board[row, col])
+        board[row, col] = 0
+        self._remove_neighbors(board, row, col)
+    
+    def _tt_probe(self, key: int) -> Optional[TTEntry]:
+        """查找置换表条目"""
+        index = key & (self.tt_size - 1)
+        entry = self._tt_deep[index]
+        if entry and entry.key == key:
+            return entry
+        entry = self._tt_recent[index]
+        if entry and entry.key == key:
+            return entry
+        return None
+    
+    def _tt_store(self, key: int, value: int, depth: int, flag: int,
+                  best_move: Optional[Tuple[int, int]]):
+        """写入置换表：更深的结果进入深度优先槽，其余进入总是替换槽"""
+        index = key & (self.tt_size - 1)
+        entry = TTEntry(key, value, depth, flag, best_move)
+        deep = self._tt_deep[index]
+        if deep is None or deep.key == key or depth >= deep.depth:
+            self._tt_deep[index] = entry
         else:
-            min_eval = float('inf')
-            for move in self._get_possible_moves(board)[:10]:  # 从8增加到10
-                board[move[0]][move[1]] = player
-                eval = self._minimax(board, depth - 1, True, alpha, beta, -player)
-                board[move[0]][move[1]] = 0
-                min_eval = min(min_eval, eval)
-                beta = min(beta, eval)
-                if beta <= alpha:
-                    break
-            return min_eval
+            self._tt_recent[index] = entry
     
-    def _get_possible_moves(self, board: np.ndarray) -> List[Tuple[int, int]]:
-        """获取所有可能的移动"""
-        moves = []
-        # 只考虑已有棋子周围的空位
-        for i in range(len(board)):
-            for j in range(len(board[0])):
-                if board[i][j] == 0 and self._has_neighbor(board, i, j):
-                    moves.append((i, j))
-        return moves if moves else [(len(board)//2, len(board[0])//2)]
+    def _tt_move_first(self, moves: List[Tuple[int, int]], entry: TTEntry) -> List[Tuple[int, int]]:
+        """将置换表中记录的最佳移动排在最前面"""
+        if entry.best_move in moves:
+            moves = list(moves)
+            moves.remove(entry.best_move)
+            moves.insert(0, entry.best_move)
+        return moves
     
-    def _has_neighbor(self, board: np.ndarray, row: int, col: int) -> bool:
-        """检查是否有相邻的棋子"""
-        for i in range(max(0, row-2), min(len(board), row+3)):
-            for j in range(max(0, col-2), min(len(board[0]), col+3)):
-                if board[i][j] != 0:
-                    return True
-        return False
+    def _negamax(self, board: np.ndarray, depth: int, alpha: int, beta: int, player: int,
+                 last_move: Tuple[int, int]) -> int:
+        """负极大值搜索（带置换表），返回值以当前行棋方 player 的角度计算"""
+        if self.stop_event.is_set():
+            raise SearchAborted
+        key = self._hash
+        entry = self._tt_probe(key)
+        if entry and entry.depth >= depth:
+            if entry.flag == EXACT:
+                return entry.value
+            elif entry.flag == LOWER:
+                alpha = max(alpha, entry.value)
+            else:
+                beta = min(beta, entry.value)
+            if alpha >= beta:
+                return entry.value
+        # 搜索窗口（已用置换表收紧），用于判断结果的边界类型
+        orig_alpha, orig_beta = alpha, beta
+        
+        if depth == 0 or self._is_game_over(board, last_move):
+            value = self._evaluate_board(board, player)
+            self._tt_store(key, value, depth, EXACT, None)
+            return value
+        
+        moves = self._get_possible_moves(board, 10)  # 从8增加到10
+        self._order_moves(moves, depth, entry)
+        
+        value = NEG_INF
+        best_move = None
+        for move in moves:
+            self._place(board, move[0], move[1], player)
+            try:
+                eval = -self._negamax(board, depth - 1, -beta, -alpha, -player, move)
+            finally:
+                self._remove(board, move[0], move[1])
+            if eval > value:
+                value = eval
+                best_move = move
+            alpha = max(alpha, eval)
+            if alpha >= beta:
+                self._record_cutoff(move, depth)
+                break
+        
+        if value <= orig_alpha:
+            flag = UPPER
+        elif value >= orig_beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self._tt_store(key, value, depth, flag, best_move)
+        return value
+    
+    def _order_moves(self, moves: List[Tuple[int, int]], depth: int, entry: Optional[TTEntry]):
+        """原地排序内部节点的走法：置换表最佳移动、杀手移动在前，其余按历史得分"""
+        if self._history_used:
+            # 稳定排序，历史得分相同的保持原顺序
+            moves.sort(key=self.history.__getitem__, reverse=True)
+        # 后移到前面的优先级更高
+        for move in reversed(self.killers[depth]):
+            if move is not None and move in moves:
+                moves.remove(move)
+                moves.insert(0, move)
+        tt_move = entry.best_move if entry else None
+        if tt_move is not None and tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+    
+    def _record_cutoff(self, move: Tuple[int, int], depth: int):
+        """记录引发 beta 剪枝的移动：更新杀手移动和历史表"""
+        killers = self.killers[depth]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[move] += depth * depth
+        self._history_used = True
+    
+    def _get_possible_moves(self, board: np.ndarray, limit: Optional[int] = None) -> List[Tuple[int, int]]:
+        """获取所有可能的移动，给出 limit 时只返回前 limit 个"""
+        # 只考虑已有棋子周围的空位（候选集合随落子增量维护），按行优先顺序返回
+        if not self._candidates:
+            return [(BOARD_SIZE // 2, BOARD_SIZE // 2)]
+        if limit is None:
+            cells = sorted(self._candidates)
+        else:
+            # 只取最小的 limit 个，不必对整个候选集合排序
+            cells = heapq.nsmallest(limit, self._candidates)
+        return [divmod(x, BOARD_SIZE) for x in cells]
     
     def _sort_moves_by_threat(self, board: np.ndarray, moves: List[Tuple[int, int]], player: int) -> List[Tuple[int, int]]:
         """根据威胁度对移动进行排序"""
         move_scores = []
         for move in moves:
+            runs, opens, jumps = scan_move(board, move[0], move[1], player)
             score = 0
-            # 检查是否能形成五连
-            board[move[0]][move[1]] = player
-            if self._is_game_over(board):
-                score += 1000000
-            # 检查是否能阻止对手五连
-            board[move[0]][move[1]] = -player
-            if self._is_game_over(board):
-                score += 900000
-            # 检查是否能形成活四
-            board[move[0]][move[1]] = player
-            if self._count_pattern(board, move[0], move[1], player, 4, True):
-                score += 100000
-            # 检查是否能阻止对手活四
-            board[move[0]][move[1]] = -player
-            if self._count_pattern(board, move[0], move[1], -player, 4, True):
-                score += 90000
-            # 检查是否能形成活三
-            board[move[0]][move[1]] = player
-            if self._count_pattern(board, move[0], move[1], player, 3, True):
-                score += 10000
-            # 检查是否能阻止对手活三
-            board[move[0]][move[1]] = -player
-            if self._count_pattern(board, move[0], move[1], -player, 3, True):
-                score += 9000
-            # 检查是否能形成活二
-            board[move[0]][move[1]] = player
-            if self._count_pattern(board, move[0], move[1], player, 2, True):
-                score += 1000
-            # 检查是否能阻止对手活二
-            board[move[0]][move[1]] = -player
-            if self._count_pattern(board, move[0], move[1], -player, 2, True):
-                score += 900
-            # 检查是否能形成跳三
-            board[move[0]][move[1]] = player
-            if self._count_jump_pattern(board, move[0], move[1], player, 3):
-                score += 8000
-            # 检查是否能阻止对手跳三
-            board[move[0]][move[1]] = -player
-            if self._count_jump_pattern(board, move[0], move[1], -player, 3):
-                score += 7000
-            # 检查是否能形成双活三
-            board[move[0]][move[1]] = player
-            if self._count_double_pattern(board, move[0], move[1], player, 3):
-                score += 50000
-            # 检查是否能阻止对手双活三
-            board[move[0]][move[1]] = -player
-            if self._count_double_pattern(board, move[0], move[1], -player, 3):
-                score += 45000
-            board[move[0]][move[1]] = 0
+            # 下标 0 为己方进攻，1 为阻止对手
+            for side, (five, four, three, two, jump3, double3) in enumerate(THREAT_SCORES):
+                run = runs[side]
+                alive = opens[side] == 2
+                # 五连
+                if run.max() >= 5:
+                    score += five
+                # 活四、活三、活二
+                if np.any(alive & (run >= 4)):
+                    score += four
+                if np.any(alive & (run >= 3)):
+                    score += three
+                if np.any(alive & (run >= 2)):
+                    score += two
+                # 跳三
+                if jumps[side].max() >= 3:
+                    score += jump3
+                # 双活三：至少两个方向同时形成活三
+                if np.count_nonzero(alive & (run >= 3)) >= 2:
+                    score += double3
             move_scores.append((move, score))
         
         # 根据分数排序
         move_scores.sort(key=lambda x: x[1], reverse=True)
         return [move for move, _ in move_scores]
     
-    def _count_pattern(self, board: np.ndarray, row: int, col: int, player: int, length: int, is_alive: bool) -> bool:
-        """计算特定模式的连续棋子数"""
-        directions = [(1,0), (0,1), (1,1), (1,-1)]
-        for dr, dc in directions:
-            count = 1
-            # 正向检查
-            r, c = row + dr, col + dc
-            while 0 <= r < len(board) and 0 <= c < len(board[0]) and board[r][c] == player:
-                count += 1
-                r += dr
-                c += dc
-            # 反向检查
-            r, c = row - dr, col - dc
-            while 0 <= r < len(board) and 0 <= c < len(board[0]) and board[r][c] == player:
-                count += 1
-                r -= dr
-                c -= dc
-            if count >= length:
-                if is_alive:
-                    # 检查两端是否都是空位
-                    r1, c1 = row + dr * count, col + dc * count
-                    r2, c2 = row - dr * count, col - dc * count
-                    if (0 <= r1 < len(board) and 0 <= c1 < len(board[0]) and board[r1][c1] == 0 and
-                        0 <= r2 < len(board) and 0 <= c2 < len(board[0]) and board[r2][c2] == 0):
-                        return True
-                else:
-                    return True
-        return False
+    def _is_game_over(self, board: np.ndarray, last_move: Tuple[int, int]) -> bool:
+        """检查最后一步是否形成五连（只检查经过该点的四条线）"""
+        row, col = last_move
+        return count_pattern(board, row, col, board[row, col], 5, False)
     
-    def _count_jump_pattern(self, board: np.ndarray, row: int, col: int, player: int, length: int) -> bool:
-        """计算跳连模式（如：X-X-X）"""
-        directions = [(1,0), (0,1), (1,1), (1,-1)]
-        for dr, dc in directions:
-            count = 1
-            # 正向检查
-            r, c = row + dr, col + dc
-            while 0 <= r < len(board) and 0 <= c < len(board[0]):
-                if board[r][c] == player:
-                    count += 1
-                elif board[r][c] != 0:
-                    break
-                r += dr
-                c += dc
-            # 反向检查
-            r, c = row - dr, col - dc
-            while 0 <= r < len(board) and 0 <= c < len(board[0]):
-                if board[r][c] == player:
-                    count += 1
-                elif board[r][c] != 0:
-                    break
-                r -= dr
-                c -= dc
-            if count >= length:
-                return True
-        return False
-    
-    def _count_double_pattern(self, board: np.ndarray, row: int, col: int, player: int, length: int) -> bool:
-        """计算双活三、双活四等模式"""
-        count = 0
-        directions = [(1,0), (0,1), (1,1), (1,-1)]
-        for dr, dc in directions:
-            if self._count_pattern(board, row, col, player, length, True):
-                count += 1
-        return count >= 2
-    
-    def _is_game_over(self, board: np.ndarray) -> bool:
-        """检查游戏是否结束"""
-        return self._count_pattern(board, 0, 0, 1, 5, False) or self._count_pattern(board, 0, 0, -1, 5, False)
-    
-    def _evaluate_board(self, board: np.ndarray, player: int) -> float:
+    def _evaluate_board(self, board: np.ndarray, player: int) -> int:
         """评估当前棋盘状态"""
-        score = 0
-        # 评估连续棋子
-        for i in range(len(board)):
-            for j in range(len(board[0])):
-                if board[i][j] == player:
-                    # 检查周围8个方向
-                    for di in [-1, 0, 1]:
-                        for dj in [-1, 0, 1]:
-                            if di == 0 and dj == 0:
-                                continue
-                            count = 1
-                            ni, nj = i + di, j + dj
-                            while 0 <= ni < len(board) and 0 <= nj < len(board[0]) and board[ni][nj] == player:
-                                count += 1
-                                ni += di
-                                nj += dj
-                            # 增加连续棋子的评分
-                            if count >= 5:
-                                score += 100000
-                            elif count == 4:
-                                score += 10000
-                            elif count == 3:
-                                score += 1000
-                            elif count == 2:
-                                score += 100
-                elif board[i][j] == -player:
-                    # 对对手的棋子进行负分评估
-                    for di in [-1, 0, 1]:
-                        for dj in [-1, 0, 1]:
-                            if di == 0 and dj == 0:
-                                continue
-                            count = 1
-                            ni, nj = i + di, j + dj
-                            while 0 <= ni < len(board) and 0 <= nj < len(board[0]) and board[ni][nj] == -player:
-                                count += 1
-                                ni += di
-                                nj += dj
-                            # 增加对手连续棋子的负分
-                            if count >= 5:
-                                score -= 90000
-                            elif count == 4:
-                                score -= 9000
-                            elif count == 3:
-                                score -= 900
-                            elif count == 2:
-                                score -= 90
-        
-        # 评估棋子的位置
-        for i in range(len(board)):
-            for j in range(len(board[0])):
-                if board[i][j] == player:
-                    # 中心位置加分
-                    if 3 <= i <= 11 and 3 <= j <= 11:
-                        score += 50
-                    # 靠近中心的位置加分
-                    elif 2 <= i <= 12 and 2 <= j <= 12:
-                        score += 30
-                elif board[i][j] == -player:
-                    # 对手的中心位置减分
-                    if 3 <= i <= 11 and 3 <= j <= 11:
-                        score -= 45
-                    # 对手靠近中心的位置减分
-                    elif 2 <= i <= 12 and 2 <= j <= 12:
-                        score -= 25
-        
-        return score 
\ No newline at end of file
+        return evaluate_board(board, player)
\ No newline at end of file
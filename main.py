@@ -3,6 +3,7 @@ import pygame
 import sys
 import numpy as np
 from ai import GomokuAI
+import threading
 import time
 
 # 初始化 Pygame
@@ -14,6 +15,8 @@ CELL_SIZE = 40
 MARGIN = 40
 PIECE_RADIUS = 18
 WINDOW_SIZE = BOARD_SIZE * CELL_SIZE + 2 * MARGIN
+# 顶部当前玩家、难度和胜负信息所在的区域
+INFO_RECT = pygame.Rect(0, 0, WINDOW_SIZE, 70)
 
 # 颜色定义
 BLACK = (0, 0, 0)
@@ -22,11 +25,16 @@ BROWN = (205, 133, 63)
 RED = (255, 0, 0)
 BLUE = (0, 0, 255)
 
+# 轮到 AI 走棋时投递的自定义事件
+AI_MOVE_EVENT = pygame.USEREVENT + 1
+# 后台 AI 线程算出结果后投递的自定义事件
+AI_DONE_EVENT = pygame.USEREVENT + 2
+
 class GomokuGame:
     def __init__(self):
         self.screen = pygame.display.set_mode((WINDOW_SIZE, WINDOW_SIZE))
         pygame.display.set_caption('五子棋')
-        self.board = np.zeros((BOARD_SIZE, BOARD_SIZE), dtype=int)
+        self.board = np.zeros((BOARD_SIZE, BOARD_SIZE), dtype=np.int8, order='C')
         self.current_player = 1  # 1: 黑子, -1: 白子
         self.game_over = False
         self.winner = None
@@ -43,36 +51,62 @@ class GomokuGame:
         self.last_move_time = 0
         self.move_delay = 0.1  # 移动延迟（秒）
         self.ai_thinking = False  # 添加AI思考状态标志
+        self.ai_thread = None
+        self.moves = []  # 已落下的棋子 (row, col, player)
+        self.background = self.render_background()
+        self.dirty_rects = []  # 需要局部刷新的区域
+        self.full_redraw = True  # 下一帧是否整屏重绘
         
-    def draw_board(self):
-        # 绘制棋盘背景
-        self.screen.fill(BROWN)
-        
-        # 绘制网格线
+    def render_background(self):
+        # 预先绘制棋盘背景和网格线
+        background = pygame.Surface((WINDOW_SIZE, WINDOW_SIZE))
+        background.fill(BROWN)
         for i in range(BOARD_SIZE):
             # 横线
-            pygame.draw.line(self.screen, BLACK,
+            pygame.draw.line(background, BLACK,
                            (MARGIN, MARGIN + i * CELL_SIZE),
                            (WINDOW_SIZE - MARGIN, MARGIN + i * CELL_SIZE))
             # 竖线
-            pygame.draw.line(self.screen, BLACK,
+            pygame.draw.line(background, BLACK,
                            (MARGIN + i * CELL_SIZE, MARGIN),
                            (MARGIN + i * CELL_SIZE, WINDOW_SIZE - MARGIN))
+        return background
+    
+    def piece_rect(self, row, col):
+        # 棋子（含阴影）占据的区域
+        x, y = MARGIN + col * CELL_SIZE, MARGIN + row * CELL_SIZE
+        return pygame.Rect(x - PIECE_RADIUS, y - PIECE_RADIUS, 2 * PIECE_RADIUS + 3, 2 * PIECE_RADIUS + 3)
+    
+    def draw_board(self):
+        if self.full_redraw:
+            self.draw_scene()
+            pygame.display.flip()
+            self.full_redraw = False
+        elif self.dirty_rects:
+            # 只重绘并刷新变化的区域
+            for rect in self.dirty_rects:
+                self.screen.set_clip(rect)
+                self.draw_scene()
+            self.screen.set_clip(None)
+            pygame.display.update(self.dirty_rects)
+        self.dirty_rects = []
+    
+    def draw_scene(self):
+        # 绘制棋盘背景
+        self.screen.blit(self.background, (0, 0))
         
         # 绘制棋子
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
-                if self.board[i][j] != 0:
-                    color = BLACK if self.board[i][j] == 1 else WHITE
-                    center = (MARGIN + j * CELL_SIZE, MARGIN + i * CELL_SIZE)
-                    # 绘制棋子阴影
-                    pygame.draw.circle(self.screen, (128, 128, 128), 
-                                    (center[0]+2, center[1]+2), PIECE_RADIUS)
-                    # 绘制棋子
-                    pygame.draw.circle(self.screen, color, center, PIECE_RADIUS)
-                    # 如果是白子，添加边框
-                    if color == WHITE:
-                        pygame.draw.circle(self.screen, BLACK, center, PIECE_RADIUS, 1)
+        for row, col, player in self.moves:
+            color = BLACK if player == 1 else WHITE
+            center = (MARGIN + col * CELL_SIZE, MARGIN + row * CELL_SIZE)
+            # 绘制棋子阴影
+            pygame.draw.circle(self.screen, (128, 128, 128), 
+                            (center[0]+2, center[1]+2), PIECE_RADIUS)
+            # 绘制棋子
+            pygame.draw.circle(self.screen, color, center, PIECE_RADIUS)
+            # 如果是白子，添加边框
+            if color == WHITE:
+                pygame.draw.circle(self.screen, BLACK, center, PIECE_RADIUS, 1)
         
         # 绘制当前玩家和难度信息
         player_text = "当前玩家: 黑子" if self.current_player == 1 else "当前玩家: 白子"
@@ -92,8 +126,6 @@ class GomokuGame:
             text_surface = self.font.render(winner_text, True, RED)
             text_rect = text_surface.get_rect(center=(WINDOW_SIZE//2, 30))
             self.screen.blit(text_surface, text_rect)
-        
-        pygame.display.flip()
     
     def get_board_position(self, mouse_pos):
         x, y = mouse_pos
@@ -107,9 +139,12 @@ class GomokuGame:
     def make_move(self, row, col):
         if self.board[row][col] == 0 and not self.game_over:
             self.board[row][col] = self.current_player
+            self.moves.append((row, col, self.current_player))
+            self.dirty_rects += [self.piece_rect(row, col), INFO_RECT]
             if self.check_winner(row, col):
                 self.game_over = True
                 self.winner = self.current_player
+                self.full_redraw = True
             else:
                 self.current_player = -self.current_player
             return True
@@ -140,26 +175,69 @@ class GomokuGame:
             current_time = time.time()
             if current_time - self.last_move_time >= self.move_delay:
                 self.ai_thinking = True
-                move = self.ai.get_move(self.board, self.current_player)
-                if move:
-                    self.make_move(move[0], move[1])
-                    self.last_move_time = current_time
-                self.ai_thinking = False
+                # 在后台线程中搜索，界面保持响应
+                self.ai_thread = threading.Thread(target=self.run_ai,
+                                                  args=(self.ai, self.board.copy(), self.current_player),
+                                                  daemon=True)
+                self.ai_thread.start()
+            else:
+                # 延迟未到，稍后再触发一次
+                remaining = self.move_delay - (current_time - self.last_move_time)
+                pygame.time.set_timer(AI_MOVE_EVENT, max(1, int(remaining * 1000)), 1)
+    
+    def run_ai(self, ai, board, player):
+        # 运行在后台线程中，出错时也要通知主线程，否则 ai_thinking 不会复位
+        move = None
+        try:
+            move = ai.get_move(board, player)
+        finally:
+            # 退出后 pygame 已关闭，不能再投递事件
+            if pygame.get_init():
+                pygame.event.post(pygame.event.Event(AI_DONE_EVENT, move=move, ai=ai))
+    
+    def finish_ai_move(self, event):
+        # 忽略已被重置或切换难度取消的 AI 的结果
+        if event.ai is not self.ai:
+            return
+        self.ai_thinking = False
+        if event.move:
+            self.make_move(event.move[0], event.move[1])
+            self.last_move_time = time.time()
+    
+    def request_ai_move(self):
+        # 轮到 AI 时通知事件循环
+        if not self.game_over and self.current_player == -1:
+            pygame.event.post(pygame.event.Event(AI_MOVE_EVENT))
+    
+    def stop_ai(self):
+        # 取消正在后台进行的搜索
+        if self.ai:
+            self.ai.stop_event.set()
+    
+    def join_ai(self, timeout=1.0):
+        # 等待后台搜索线程退出
+        if self.ai_thread is not None:
+            self.ai_thread.join(timeout)
     
     def change_difficulty(self):
         difficulties = ['easy', 'medium', 'hard']
         current_index = difficulties.index(self.difficulty)
         self.difficulty = difficulties[(current_index + 1) % len(difficulties)]
+        self.stop_ai()
         self.ai = GomokuAI(self.difficulty)
+        self.dirty_rects.append(INFO_RECT)
     
     def reset_game(self):
-        self.board = np.zeros((BOARD_SIZE, BOARD_SIZE), dtype=int)
+        self.board = np.zeros((BOARD_SIZE, BOARD_SIZE), dtype=np.int8, order='C')
         self.current_player = 1
         self.game_over = False
         self.winner = None
         self.last_move_time = 0
         self.ai_thinking = False
+        self.moves = []
+        self.full_redraw = True
         # 重置 AI
+        self.stop_ai()
         self.ai = GomokuAI(self.difficulty)
         # 重置移动计数
         if self.ai:
@@ -168,39 +246,45 @@ class GomokuGame:
 def main():
     game = GomokuGame()
     game.ai = GomokuAI(game.difficulty)
-    clock = pygame.time.Clock()
     running = True
+    game.draw_board()
     
+    # 只在有事件时处理和重绘，空闲时阻塞等待
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            running = False
+        elif event.type == pygame.MOUSEBUTTONDOWN and not game.ai_thinking:
+            if event.button == 1:  # 左键点击
+                pos = game.get_board_position(event.pos)
+                if pos and not game.game_over and game.current_player == 1:
+                    if game.make_move(pos[0], pos[1]):
+                        game.draw_board()
+                        pygame.time.wait(100)  # 等待一小段时间
+                        game.request_ai_move()
+            elif event.button == 3:  # 右键点击
+                game.change_difficulty()
+                game.reset_game()  # 切换难度时也重置游戏
+                game.draw_board()
+        elif event.type == pygame.KEYUP:  # 改为 KEYUP 事件
+            if event.key == pygame.K_r:  # 按R键重置游戏
+                print("重置游戏")  # 添加调试信息
+                game.reset_game()
+                game.draw_board()
+            elif event.key == pygame.K_ESCAPE:  # 按ESC键退出
+                print("退出游戏")  # 添加调试信息
                 running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN and not game.ai_thinking:
-                if event.button == 1:  # 左键点击
-                    pos = game.get_board_position(event.pos)
-                    if pos and not game.game_over and game.current_player == 1:
-                        if game.make_move(pos[0], pos[1]):
-                            game.draw_board()
-                            pygame.time.wait(100)  # 等待一小段时间
-                elif event.button == 3:  # 右键点击
-                    game.change_difficulty()
-                    game.reset_game()  # 切换难度时也重置游戏
-            elif event.type == pygame.KEYUP:  # 改为 KEYUP 事件
-                if event.key == pygame.K_r:  # 按R键重置游戏
-                    print("重置游戏")  # 添加调试信息
-                    game.reset_game()
-                    game.draw_board()
-                elif event.key == pygame.K_ESCAPE:  # 按ESC键退出
-                    print("退出游戏")  # 添加调试信息
-                    running = False
-        
-        # AI移动
-        if game.current_player == -1 and not game.game_over and not game.ai_thinking:
+        elif event.type == AI_MOVE_EVENT:  # AI移动
             game.ai_move()
-        
-        game.draw_board()
-        clock.tick(60)  # 限制帧率为60FPS
+        elif event.type == AI_DONE_EVENT:  # AI计算完成
+            game.finish_ai_move(event)
+            game.draw_board()
+        elif event.type == pygame.WINDOWEXPOSED:  # 窗口被遮挡后重新显示
+            game.full_redraw = True
+            game.draw_board()
     
+    game.stop_ai()
+    game.join_ai()
     pygame.quit()
     sys.exit()
 